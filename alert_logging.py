@@ -0,0 +1,162 @@
+"""
+报警日志写入模块
+突发写入时合并多条日志为一次磁盘写入
+"""
+import logging
+import os
+import time
+from logging.handlers import QueueListener, TimedRotatingFileHandler
+import orjson
+
+# 日志文件写缓冲区大小（1 MiB）
+LOG_BUFFER_SIZE = 1 << 20
+
+
+def dated_log_name(default_name: str) -> str:
+    """
+    将滚动后的默认归档文件名转换为按日期命名的文件名
+    
+    例如 logs/alerts.log.20260101 转换为 logs/alerts_20260101.log，
+    与按日期分文件的旧版日志命名保持一致。
+    
+    Args:
+        default_name: TimedRotatingFileHandler 生成的默认归档文件名
+        
+    Returns:
+        str: 归档文件名
+    """
+    base, _, date = default_name.rpartition(".")
+    root, ext = os.path.splitext(base)
+    return f"{root}_{date}{ext}"
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    报警日志格式化器
+    
+    日志记录通过 extra={"payload": ...} 携带报警数据时，在格式化阶段才将其转为文本
+    追加到消息之后：bytes 直接按 UTF-8 解码，其他对象使用 orjson 紧凑序列化。
+    格式化发生在 QueueListener 的后台线程中，不占用事件循环。
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        格式化日志记录
+        
+        Args:
+            record: 日志记录
+            
+        Returns:
+            str: 格式化后的日志文本
+        """
+        text = super().format(record)
+        payload = record.__dict__.get("payload")
+        if payload is None:
+            return text
+        if isinstance(payload, bytes):
+            payload_text = payload.decode()
+        else:
+            payload_text = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+        return f"{text}: {payload_text}"
+
+
+class BufferedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    带大缓冲区的按时间滚动文件处理器
+    
+    每条记录写入后不立即刷新磁盘，由 FlushOnIdleQueueListener 在日志队列
+    清空时统一刷新，突发写入时多条记录合并为一次 write() 系统调用。
+    """
+    
+    def _open(self):
+        """以大缓冲区打开日志文件"""
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=LOG_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+    
+    def doRollover(self):
+        """
+        执行日志滚动，允许多个工作进程写同一个日志文件
+        
+        归档文件名和下次滚动时间的计算（包括 UTC 和夏令时切换的处理）与
+        TimedRotatingFileHandler 保持一致，只替换删除并重命名的步骤：
+        使用 os.link 原子地创建带日期的归档文件，归档已存在说明其他工作进程
+        已完成本次滚动，此时只重新打开日志文件，不会覆盖或删除已归档的日志。
+        """
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        # 本周期开始时间对应的时间元组，用于生成归档文件名
+        current_time = int(time.time())
+        dst_now = time.localtime(current_time)[-1]
+        t = self.rolloverAt - self.interval
+        if self.utc:
+            time_tuple = time.gmtime(t)
+        else:
+            time_tuple = time.localtime(t)
+            dst_then = time_tuple[-1]
+            if dst_now != dst_then:
+                addend = 3600 if dst_now else -3600
+                time_tuple = time.localtime(t + addend)
+        dfn = self.rotation_filename(self.baseFilename + "." + time.strftime(self.suffix, time_tuple))
+        try:
+            os.link(self.baseFilename, dfn)
+        except (FileExistsError, FileNotFoundError):
+            # 其他工作进程已完成滚动，或当前周期内没有日志
+            pass
+        else:
+            os.unlink(self.baseFilename)
+        if self.backupCount > 0:
+            for s in self.getFilesToDelete():
+                os.remove(s)
+        if not self.delay:
+            self.stream = self._open()
+        new_rollover_at = self.computeRollover(current_time)
+        while new_rollover_at <= current_time:
+            new_rollover_at += self.interval
+        # 按天或按周滚动时，如果到下次滚动前夏令时发生切换，需要修正一小时
+        if (self.when == "MIDNIGHT" or self.when.startswith("W")) and not self.utc:
+            dst_at_rollover = time.localtime(new_rollover_at)[-1]
+            if dst_now != dst_at_rollover:
+                new_rollover_at += -3600 if not dst_now else 3600
+        self.rolloverAt = new_rollover_at
+    
+    def flush(self):
+        """StreamHandler.emit 每写一条记录都会调用，此处不刷新，留给 flush_buffer"""
+        pass
+    
+    def flush_buffer(self):
+        """将缓冲区中的日志写入磁盘"""
+        super().flush()
+
+
+class FlushOnIdleQueueListener(QueueListener):
+    """日志队列清空时才刷新处理器缓冲区的 QueueListener"""
+    
+    def dequeue(self, block):
+        """
+        从队列取出一条日志记录，阻塞等待前先刷新所有处理器
+        
+        Args:
+            block: 是否阻塞等待
+            
+        Returns:
+            队列中的下一条日志记录
+        """
+        if block and self.queue.empty():
+            self._flush_handlers()
+        return self.queue.get(block)
+    
+    def stop(self):
+        """停止后台线程，并刷新剩余的缓冲日志"""
+        super().stop()
+        self._flush_handlers()
+    
+    def _flush_handlers(self):
+        """刷新所有处理器的缓冲区"""
+        for handler in self.handlers:
+            getattr(handler, "flush_buffer", handler.flush)()
@@ -1,14 +1,17 @@
 """
 配置管理模块
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import BaseModel, Field
+from functools import lru_cache
 import os
+import tomllib
 from pathlib import Path
+import orjson
 
 
-class ProviderConfig(BaseSettings):
+class ProviderConfig(BaseModel):
     """云平台提供者配置"""
     name: str = Field(..., description="提供者名称")
     enabled: bool = Field(default=True, description="是否启用")
@@ -17,71 +20,109 @@ class ProviderConfig(BaseSettings):
     timeout: int = Field(default=30, description="超时时间（秒）")
 
 
-def load_providers_config():
+# Provider 配置文件查找顺序：优先读取静态的 TOML/JSON 配置，最后回退到 providers_config.py
+PROVIDERS_CONFIG_FILES = ("providers_config.toml", "providers_config.json", "providers_config.py")
+
+
+def _read_config_bytes(config_file: Path) -> bytes:
+    """以大缓冲区一次性读取配置文件内容"""
+    with open(config_file, "rb", buffering=1 << 20) as f:
+        return f.read()
+
+
+def _parse_providers(config_file: Path, data: bytes):
     """
-    从 providers_config.py 文件加载 Provider 配置
+    解析 Provider 配置文件内容
+    
+    TOML 文件使用 [[providers]] 表数组，JSON 文件顶层直接为 Provider 列表，
+    Python 文件读取其中的 PROVIDERS 变量。
     
+    Args:
+        config_file: 配置文件路径
+        data: 配置文件内容
+        
     Returns:
-        List[dict]: Provider 配置列表
+        解析得到的 Provider 配置，未找到时返回 None
     """
-    config_file = Path("providers_config.py")
+    if config_file.suffix == ".toml":
+        providers = tomllib.loads(data.decode("utf-8")).get("providers")
+        if providers is None:
+            print(f"警告: {config_file} 中未找到 [[providers]] 配置")
+        return providers
+    if config_file.suffix == ".json":
+        return orjson.loads(data)
     
-    if not config_file.exists():
-        print(f"信息: providers_config.py 文件不存在，将使用默认配置")
-        return []
+    module_globals = {"__name__": "providers_config", "__file__": str(config_file)}
+    exec(compile(data, str(config_file), "exec"), module_globals)
+    if "PROVIDERS" not in module_globals:
+        print(f"警告: {config_file} 中未找到 PROVIDERS 变量")
+        return None
+    return module_globals["PROVIDERS"]
+
+
+@lru_cache(maxsize=1)
+def load_providers_config():
+    """
+    从 Provider 配置文件加载 Provider 配置
     
-    try:
-        # 动态导入配置文件
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("providers_config", config_file)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            if hasattr(module, "PROVIDERS"):
-                providers = module.PROVIDERS
-                if providers and isinstance(providers, list) and len(providers) > 0:
-                    print(f"信息: 成功从 providers_config.py 加载 {len(providers)} 个 Provider 配置")
-                    return providers
-                else:
-                    print(f"警告: providers_config.py 中的 PROVIDERS 列表为空或格式不正确")
-                    return []
+    按 PROVIDERS_CONFIG_FILES 的顺序查找，使用第一个存在的文件。
+    直接尝试读取文件，不存在时跳到下一个，不做额外的 stat 检查。
+    结果会被缓存，同一进程内多次构造 AppConfig 不会重复解析配置文件。
+    调用方不应修改返回的列表。
+    
+    Returns:
+        List[dict]: Provider 配置列表
+    """
+    for name in PROVIDERS_CONFIG_FILES:
+        config_file = Path(name)
+        try:
+            data = _read_config_bytes(config_file)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            # 例如挂载时宿主机文件不存在，Docker 创建了同名目录
+            print(f"错误: 加载 {config_file} 失败: {e}")
+            return []
+        
+        try:
+            providers = _parse_providers(config_file, data)
+            if providers is None:
+                return []
+            if providers and isinstance(providers, list) and len(providers) > 0:
+                print(f"信息: 成功从 {config_file} 加载 {len(providers)} 个 Provider 配置")
+                return providers
             else:
-                print(f"警告: providers_config.py 中未找到 PROVIDERS 变量")
+                print(f"警告: {config_file} 中的 Provider 列表为空或格式不正确")
                 return []
-        else:
-            print(f"错误: 无法创建 providers_config.py 模块规范")
+        except Exception as e:
+            print(f"错误: 加载 {config_file} 失败: {e}")
+            import traceback
+            traceback.print_exc()
             return []
-    except Exception as e:
-        print(f"错误: 加载 providers_config.py 失败: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+    
+    print(f"信息: 未找到 Provider 配置文件（{', '.join(PROVIDERS_CONFIG_FILES)}），将使用默认配置")
+    return []
 
 
-class AppConfig(BaseSettings):
-    """应用配置"""
-    host: str = Field(default="0.0.0.0", description="监听地址")
-    port: int = Field(default=8048, description="监听端口")
-    load_balancer_strategy: str = Field(default="round_robin", description="负载均衡策略 (目前仅支持 round_robin)")
-    providers: List[ProviderConfig] = Field(default_factory=list, description="云平台提供者列表")
+def build_provider_configs(providers_data: List[Dict[str, Any]]) -> List[ProviderConfig]:
+    """
+    将 Provider 配置字典转换为 ProviderConfig 实例
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    默认使用 model_validate 校验字段（缺少 name、endpoint 等必填字段时报错）；
+    设置环境变量 PROVIDERS_VALIDATE=0 时使用 model_construct 跳过校验。
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # 如果providers为空，尝试从 providers_config.py 文件加载配置
-        if not self.providers:
-            providers_data = load_providers_config()
-            if providers_data:
-                try:
-                    self.providers = [ProviderConfig(**p) for p in providers_data]
-                    print(f"信息: 成功从 providers_config.py 解析 {len(self.providers)} 个 Provider 配置")
-                except (TypeError, ValueError) as e:
-                    error_msg = f"解析 providers_config.py 中的配置失败: {e}"
-                    print(f"错误: {error_msg}")
-                    raise ValueError(error_msg)
+    Args:
+        providers_data: Provider 配置字典列表
+        
+    Returns:
+        List[ProviderConfig]: Provider 配置列表
+        
+    Raises:
+        ValueError: 如果配置字段校验失败
+    """
+    if os.environ.get("PROVIDERS_VALIDATE") == "0":
+        return [ProviderConfig.model_construct(**p) for p in providers_data]
+    return [ProviderConfig.model_validate(p) for p in providers_data]
 
 
 # 默认配置示例
@@ -95,3 +136,51 @@ DEFAULT_PROVIDERS = [
     # },
 ]
 
+# 默认配置在模块加载时转换一次，之后每次构造 AppConfig 直接复用
+_DEFAULT_PROVIDER_CONFIGS = tuple(build_provider_configs(DEFAULT_PROVIDERS))
+
+
+@lru_cache(maxsize=1)
+def _load_provider_configs() -> Tuple[ProviderConfig, ...]:
+    """
+    加载并解析 Provider 配置文件，结果按进程缓存
+    
+    Returns:
+        Tuple[ProviderConfig, ...]: Provider 配置，未找到时为空
+        
+    Raises:
+        ValueError: 如果配置解析失败
+    """
+    providers_data = load_providers_config()
+    if not providers_data:
+        return ()
+    try:
+        provider_configs = tuple(build_provider_configs(providers_data))
+    except (TypeError, ValueError) as e:
+        error_msg = f"解析 Provider 配置失败: {e}"
+        print(f"错误: {error_msg}")
+        raise ValueError(error_msg)
+    return provider_configs
+
+
+class AppConfig(BaseSettings):
+    """应用配置"""
+    host: str = Field(default="0.0.0.0", description="监听地址")
+    port: int = Field(default=8048, description="监听端口")
+    workers: int = Field(default=1, description="uvicorn 工作进程数")
+    load_balancer_strategy: str = Field(default="round_robin", description="负载均衡策略 (round_robin 轮询，或 mirror 同时转发给所有 Provider)")
+    split_alerts: bool = Field(default=False, description="是否将一次 webhook 中的多条报警拆分后分别转发")
+    max_concurrent_forwards: int = Field(default=256, gt=0, description="同时进行中的转发请求上限（必须大于 0）")
+    batch_max_size: int = Field(default=0, description="批量转发时每批最多包含的 webhook 数量（0 表示不启用批量转发）")
+    batch_max_delay_ms: int = Field(default=50, description="批量转发时等待凑批的最长时间（毫秒）")
+    providers: List[ProviderConfig] = Field(default_factory=list, description="云平台提供者列表")
+    
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # 如果providers为空，尝试从 Provider 配置文件加载配置，仍为空时使用默认配置
+        if not self.providers:
+            self.providers = list(_load_provider_configs() or _DEFAULT_PROVIDER_CONFIGS)
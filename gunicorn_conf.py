@@ -0,0 +1,21 @@
+"""
+gunicorn 配置文件
+多核部署时使用: gunicorn -c gunicorn_conf.py main:app
+"""
+import multiprocessing
+import os
+
+# 监听地址，与 AppConfig 使用相同的 HOST / PORT 环境变量
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '8048')}"
+
+# 工作进程数，默认 2 * CPU 核数 + 1，可通过 WORKERS 环境变量覆盖
+workers = int(os.environ.get("WORKERS", multiprocessing.cpu_count() * 2 + 1))
+
+# 使用 uvicorn 的 ASGI 工作进程
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# 长连接保持时间（秒），应大于上游代理的空闲超时
+keepalive = 75
+
+# 不预加载应用：日志后台线程和 HTTP 连接池在每个工作进程的 lifespan 中各自创建
+preload_app = False
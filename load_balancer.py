@@ -3,9 +3,28 @@
 支持多种负载均衡策略
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Dict, Any, Tuple
 from providers import Provider
 
+# 默认的最大并发转发数
+DEFAULT_MAX_CONCURRENT_FORWARDS = 256
+
+
+@dataclass(slots=True)
+class SendResult:
+    """
+    单次转发的结果
+    
+    镜像转发时 provider 为成功接收的 Provider 名称（逗号分隔），
+    failed_providers 为发送失败的 Provider 名称。
+    """
+    success: bool
+    provider: Optional[str]
+    error: Optional[str]
+    failed_providers: Tuple[str, ...] = ()
+
 
 class BaseLoadBalancer(ABC):
     """负载均衡器基类"""
@@ -20,15 +39,15 @@ class BaseLoadBalancer(ABC):
         self.providers: List[Provider] = providers
     
     @abstractmethod
-    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def send(self, body: bytes) -> SendResult:
         """
         发送 webhook 请求
         
         Args:
-            payload: 要发送的数据（Grafana webhook 原始格式）
+            body: 要发送的原始 JSON 请求体（Grafana webhook 原始格式）
             
         Returns:
-            Dict[str, Any]: 发送结果
+            SendResult: 发送结果
         """
         pass
     
@@ -43,75 +62,116 @@ class BaseLoadBalancer(ABC):
         pass
 
 
-class RoundRobinLoadBalancer(BaseLoadBalancer):
-    """轮询负载均衡器（Round Robin）"""
-    def __init__(self, providers: List[Provider]):
+class LoadBalancer(BaseLoadBalancer):
+    """负载均衡器，Provider 的选择逻辑由策略函数决定"""
+    def __init__(
+        self,
+        providers: List[Provider],
+        strategy: Optional["Strategy"],
+        max_concurrent_forwards: int = DEFAULT_MAX_CONCURRENT_FORWARDS
+    ):
         """
         初始化负载均衡器
         
         Args:
             providers: Provider 列表
+            strategy: 策略函数，接收负载均衡器实例并返回选中的 Provider；
+                      不按单个 Provider 转发的子类（如 MirrorLoadBalancer）传入 None
+            max_concurrent_forwards: 同时进行中的转发请求上限，超出的请求排队等待
         """
         super().__init__(providers)
+        self.strategy = strategy
+        self._forward_semaphore = asyncio.Semaphore(max_concurrent_forwards)
+        self._providers_tuple = tuple(providers)
+        self._configs = tuple(p.config for p in providers)
         self.current_index = 0
+        # 可用性位图：第 i 位为 1 表示第 i 个 Provider 可用
+        self._availability = 0
+        # get_status 的缓存结果，仅在可用状态变化时重建
+        self._status_cache: Dict[str, Any] = {}
+        self.refresh_availability()
+        for provider in self._providers_tuple:
+            provider.add_availability_listener(self._on_availability_change)
+    
+    def _on_availability_change(self, provider: Provider):
+        """Provider 可用状态变化时的回调"""
+        self.refresh_availability()
+    
+    def refresh_availability(self):
+        """
+        根据各 Provider 的当前状态重建可用性位图和状态缓存
+        
+        Provider 通过 set_enabled 变更状态时会自动触发。
+        """
+        mask = 0
+        for i, provider in enumerate(self._providers_tuple):
+            if provider.is_available:
+                mask |= 1 << i
+        self._availability = mask
+        self._status_cache = self._build_status()
     
     def get_next_provider(self) -> Optional[Provider]:
         """
-        获取下一个可用的 Provider（轮询策略）
+        按策略获取下一个可用的 Provider
         
         Returns:
-            Optional[Provider]: 可用的 Provider，如果没有则返回 None
+            Optional[Provider]: 可用的 Provider，如果没有或未设置策略则返回 None
         """
-        if not self.providers:
+        if self.strategy is None:
             return None
-        
-        # 尝试找到可用的 Provider
-        attempts = 0
-        max_attempts = len(self.providers)
-        
-        while attempts < max_attempts:
-            provider = self.providers[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.providers)
-            
-            if provider.is_available:
-                return provider
-            
-            attempts += 1
-        
-        # 所有 Provider 都不可用
-        return None
+        return self.strategy(self)
     
-    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def send(self, body: bytes) -> SendResult:
         """
-        发送 webhook 请求（使用轮询策略）
+        发送 webhook 请求（使用配置的策略选择 Provider）
         
         Args:
-            payload: 要发送的数据（Grafana webhook 原始格式）
+            body: 要发送的原始 JSON 请求体（Grafana webhook 原始格式）
             
         Returns:
-            Dict[str, Any]: 发送结果
+            SendResult: 发送结果
         """
         provider = self.get_next_provider()
         
         if provider is None:
-            return {
-                "success": False,
-                "error": "没有可用的云平台提供者",
-                "provider": None
-            }
-        
-        success = await provider.send_webhook(payload)
-        
-        return {
-            "success": success,
-            "provider": provider.name,
-            "error": None if success else "发送失败"
-        }
+            return SendResult(success=False, provider=None, error="没有可用的云平台提供者")
+        
+        success = await self._forward(provider, body)
+        
+        return SendResult(
+            success=success,
+            provider=provider.name,
+            error=None if success else "发送失败"
+        )
+    
+    async def _forward(self, provider: Provider, body: bytes) -> bool:
+        """
+        在并发上限内将请求体转发给指定的 Provider
+        
+        Args:
+            provider: 目标 Provider
+            body: 要发送的原始 JSON 请求体
+            
+        Returns:
+            bool: 是否发送成功
+        """
+        async with self._forward_semaphore:
+            return await provider.send_webhook(body)
     
     def get_status(self) -> Dict[str, Any]:
         """
         获取所有 Provider 的状态
         
+        Returns:
+            Dict[str, Any]: Provider 状态信息（缓存结果的副本，调用方可以修改）
+        """
+        cache = self._status_cache
+        return {**cache, "providers": [dict(p) for p in cache["providers"]]}
+    
+    def _build_status(self) -> Dict[str, Any]:
+        """
+        构建所有 Provider 的状态信息
+        
         Returns:
             Dict[str, Any]: Provider 状态信息
         """
@@ -121,37 +181,136 @@ class RoundRobinLoadBalancer(BaseLoadBalancer):
             "available": 0
         }
         
-        for provider in self.providers:
-            provider_status = {
-                "name": provider.name,
-                "enabled": provider.config.enabled,
-                "available": provider.is_available,
-                "endpoint": provider.config.endpoint
-            }
-            status["providers"].append(provider_status)
-            if provider.is_available:
-                status["available"] += 1
+        provider_statuses = status["providers"]
+        available_count = 0
+        for provider, config in zip(self._providers_tuple, self._configs):
+            available = provider.is_available
+            provider_statuses.append({
+                "name": config.name,
+                "enabled": available,
+                "available": available,
+                "endpoint": config.endpoint
+            })
+            if available:
+                available_count += 1
+        status["available"] = available_count
         
         return status
 
 
-# class WeightedRoundRobinLoadBalancer(BaseLoadBalancer):
-#     """加权轮询负载均衡器（暂未实现，使用轮询策略代替）"""
+class MirrorLoadBalancer(LoadBalancer):
+    """镜像负载均衡器，将每个请求同时转发给所有可用的 Provider"""
+    
+    def __init__(
+        self,
+        providers: List[Provider],
+        max_concurrent_forwards: int = DEFAULT_MAX_CONCURRENT_FORWARDS
+    ):
+        """
+        初始化镜像负载均衡器
+        
+        Args:
+            providers: Provider 列表
+            max_concurrent_forwards: 同时进行中的转发请求上限，超出的请求排队等待
+        """
+        super().__init__(providers, None, max_concurrent_forwards)
+    
+    async def send(self, body: bytes) -> SendResult:
+        """
+        发送 webhook 请求到所有可用的 Provider（并发执行）
+        
+        Args:
+            body: 要发送的原始 JSON 请求体（Grafana webhook 原始格式）
+            
+        Returns:
+            SendResult: 发送结果，至少一个 Provider 接收成功即视为成功，
+                        发送失败的 Provider 记录在 failed_providers 中
+        """
+        mask = self._availability
+        providers = [p for i, p in enumerate(self._providers_tuple) if mask >> i & 1]
+        if not providers:
+            return SendResult(success=False, provider=None, error="没有可用的云平台提供者")
+        
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._forward(provider, body)) for provider in providers]
+        
+        succeeded = [p.name for p, task in zip(providers, tasks) if task.result()]
+        failed = tuple(p.name for p, task in zip(providers, tasks) if not task.result())
+        return SendResult(
+            success=bool(succeeded),
+            provider=", ".join(succeeded) or None,
+            error="发送失败" if failed else None,
+            failed_providers=failed
+        )
+
+
+Strategy = Callable[[LoadBalancer], Optional[Provider]]
+
+
+def _pick_round_robin(balancer: LoadBalancer) -> Optional[Provider]:
+    """
+    轮询策略（Round Robin）
+    
+    从 current_index 开始在可用性位图中查找下一个置位的 Provider，
+    到达末尾后回绕到最低位。
+    
+    Args:
+        balancer: 负载均衡器实例
+        
+    Returns:
+        Optional[Provider]: 可用的 Provider，如果没有则返回 None
+    """
+    mask = balancer._availability
+    if not mask:
+        # 所有 Provider 都不可用
+        return None
+    
+    i = balancer.current_index
+    high = mask >> i
+    if high:
+        index = i + (high & -high).bit_length() - 1
+    else:
+        index = (mask & -mask).bit_length() - 1
+    
+    providers = balancer._providers_tuple
+    next_index = index + 1
+    balancer.current_index = next_index if next_index < len(providers) else 0
+    return providers[index]
+
+
+# def _pick_weighted(balancer: LoadBalancer) -> Optional[Provider]:
+#     """加权轮询策略（暂未实现，使用轮询策略代替）"""
 #     pass
 
 
-# class LeastConnectionsLoadBalancer(BaseLoadBalancer):
-#     """最少连接负载均衡器（暂未实现，使用轮询策略代替）"""
+# def _pick_least_connections(balancer: LoadBalancer) -> Optional[Provider]:
+#     """最少连接策略（暂未实现，使用轮询策略代替）"""
 #     pass
 
 
-def create_load_balancer(strategy: str, providers: List[Provider]) -> BaseLoadBalancer:
+# 策略名称到策略函数的映射
+_STRATEGY_MAP: Dict[str, Strategy] = {
+    "round_robin": _pick_round_robin,
+    # "weighted_round_robin": _pick_weighted,  # 暂未实现
+    # "least_connections": _pick_least_connections,  # 暂未实现
+}
+
+# 镜像策略：每个请求同时转发给所有可用的 Provider
+MIRROR_STRATEGY = "mirror"
+
+
+def create_load_balancer(
+    strategy: str,
+    providers: List[Provider],
+    max_concurrent_forwards: int = DEFAULT_MAX_CONCURRENT_FORWARDS
+) -> BaseLoadBalancer:
     """
     根据策略创建负载均衡器实例
     
     Args:
-        strategy: 负载均衡策略名称（"round_robin"）
+        strategy: 负载均衡策略名称（"round_robin" 或 "mirror"）
         providers: Provider 列表
+        max_concurrent_forwards: 同时进行中的转发请求上限
         
     Returns:
         BaseLoadBalancer: 负载均衡器实例
@@ -159,14 +318,13 @@ def create_load_balancer(strategy: str, providers: List[Provider]) -> BaseLoadBa
     Raises:
         ValueError: 如果策略名称无效
     """
-    strategy_map = {
-        "round_robin": RoundRobinLoadBalancer,
-        # "weighted_round_robin": WeightedRoundRobinLoadBalancer,  # 暂未实现
-        # "least_connections": LeastConnectionsLoadBalancer,  # 暂未实现
-    }
+    name = strategy.lower()
+    if name == MIRROR_STRATEGY:
+        return MirrorLoadBalancer(providers, max_concurrent_forwards)
     
-    balancer_class = strategy_map.get(strategy.lower())
-    if balancer_class is None:
-        raise ValueError(f"无效的负载均衡策略: {strategy}. 可用策略: {', '.join(strategy_map.keys())}")
+    pick = _STRATEGY_MAP.get(name)
+    if pick is None:
+        available = ", ".join([*_STRATEGY_MAP.keys(), MIRROR_STRATEGY])
+        raise ValueError(f"无效的负载均衡策略: {strategy}. 可用策略: {available}")
     
-    return balancer_class(providers)
\ No newline at end of file
+    return LoadBalancer(providers, pick, max_concurrent_forwards)
\ No newline at end of file
@@ -1,166 +1,464 @@
 """
 Webhook报警接收服务主入口
 """
-from fastapi import FastAPI
-from typing import Dict, Any
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
+from typing import Dict, Any, List, Tuple
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
 import uvicorn
+import httpx
 import logging
-import json
-from datetime import datetime
+import queue
+from anyio import to_thread
+from logging.handlers import QueueHandler
+import orjson
 from pathlib import Path
-from config import AppConfig, ProviderConfig, DEFAULT_PROVIDERS
+from config import AppConfig, ProviderConfig
+from alert_logging import BufferedTimedRotatingFileHandler, FlushOnIdleQueueListener, JsonLogFormatter, dated_log_name
 from providers import Provider
-from load_balancer import create_load_balancer, BaseLoadBalancer
+from load_balancer import create_load_balancer
 
-app = FastAPI(title="Webhook报警接收服务", version="1.0.0")
+# /webhook 成功响应的结构固定，预先序列化为 bytes
+LOCAL_ONLY_RESPONSE_BODY = orjson.dumps({
+    "status": "success",
+    "message": "Alert received and recorded in local log only"
+})
 
-# 日志记录器
-alert_logger = None
+BATCH_QUEUED_RESPONSE_BODY = orjson.dumps({
+    "status": "success",
+    "message": "Alert received and queued for batch forwarding"
+})
 
-# 负载均衡器实例
-load_balancer: BaseLoadBalancer = None
 
+@lru_cache(maxsize=128)
+def forwarded_response_body(provider_name: str) -> bytes:
+    """
+    获取转发成功时的响应体（按 Provider 名称缓存）
+    
+    拆分转发和镜像转发时名称为多个 Provider 的组合，组合随轮询位置和
+    发送结果变化，因此限制缓存大小。
+    
+    Args:
+        provider_name: 转发到的 Provider 名称
+        
+    Returns:
+        bytes: 序列化后的 JSON 响应体
+    """
+    return orjson.dumps({
+        "status": "success",
+        "message": f"Alert received and forwarded to {provider_name}"
+    })
 
-def setup_logging():
-    """配置日志记录"""
-    global alert_logger
+
+def setup_logging() -> Tuple[logging.Logger, FlushOnIdleQueueListener]:
+    """
+    配置日志记录
     
-    # 创建logs目录
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    报警日志记录器只挂载 QueueHandler，请求协程中的日志调用仅做入队；
+    格式化后的写盘由 QueueListener 在后台线程中完成，不阻塞事件循环，
+    突发日志在缓冲区中合并，队列清空时才写入磁盘。
+    
+    同一进程内可能多次执行（例如 python main.py 时模块先作为 __main__ 导入，
+    uvicorn 再以 main 导入一次），已配置过时直接复用已有的处理器和写入线程，
+    避免重复挂载 QueueHandler 导致日志写入无人消费的队列。
     
+    Returns:
+        Tuple[logging.Logger, FlushOnIdleQueueListener]: 报警日志记录器和后台写入线程（尚未启动）
+    """
     # 创建报警日志记录器
     alert_logger = logging.getLogger("alert_logger")
+    for handler in alert_logger.handlers:
+        listener = getattr(handler, "listener", None)
+        if isinstance(handler, QueueHandler) and listener is not None:
+            return alert_logger, listener
     alert_logger.setLevel(logging.INFO)
     
-    # 文件处理器 - 按日期滚动
-    log_file = log_dir / f"alerts_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # 创建logs目录
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+    
+    # 文件处理器 - 每天零点滚动，首次写入时才打开文件，队列清空时才刷新缓冲区
+    # 当天日志写入 alerts.log，滚动后归档为 alerts_YYYYMMDD.log
+    file_handler = BufferedTimedRotatingFileHandler(
+        log_dir / "alerts.log",
+        when="midnight",
+        encoding='utf-8',
+        delay=True
+    )
+    file_handler.suffix = "%Y%m%d"
+    file_handler.namer = dated_log_name
     file_handler.setLevel(logging.INFO)
     
     # 格式化器
-    formatter = logging.Formatter(
+    formatter = JsonLogFormatter(
         '%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(formatter)
     
-    # 添加处理器
-    alert_logger.addHandler(file_handler)
+    # 队列处理器 - 文件写入交由后台线程完成
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    log_listener = FlushOnIdleQueueListener(log_queue, file_handler, respect_handler_level=True)
+    queue_handler.listener = log_listener
+    alert_logger.addHandler(queue_handler)
+    
+    # Provider 的发送错误也写入报警日志，经同一个队列异步落盘
+    provider_logger = logging.getLogger("providers")
+    provider_logger.setLevel(logging.INFO)
+    provider_logger.addHandler(queue_handler)
     
     # 防止日志传播到根记录器
     alert_logger.propagate = False
+    provider_logger.propagate = False
     
-    return alert_logger
+    return alert_logger, log_listener
 
 
-@app.on_event("startup")
-async def startup_event():
-    """应用启动时初始化日志和负载均衡器"""
-    global alert_logger, load_balancer
+def split_alert_bodies(payload: Dict[str, Any], alerts: List[Any]) -> List[bytes]:
+    """
+    将一次 webhook 中的多条报警拆分为多个只包含单条报警的请求体
     
-    # 初始化日志
-    alert_logger = setup_logging()
-    alert_logger.info("=" * 50)
-    alert_logger.info("Webhook报警接收服务启动")
+    除 alerts 外的公共字段只序列化一次，每条报警的请求体由公共前缀、
+    该报警的序列化结果和固定后缀拼接而成（alerts 字段位于最后）。
     
-    # 加载配置
-    config = AppConfig()
+    Args:
+        payload: 解析后的 webhook 数据
+        alerts: payload 中的报警列表
+        
+    Returns:
+        List[bytes]: 每条报警对应的 JSON 请求体
+    """
+    envelope = orjson.dumps({k: v for k, v in payload.items() if k != "alerts"})
+    if envelope == b"{}":
+        prefix = b'{"alerts":['
+    else:
+        prefix = envelope[:-1] + b',"alerts":['
+    return [prefix + orjson.dumps(alert) + b"]}" for alert in alerts]
+
+
+async def build_provider(provider_config: ProviderConfig, client: httpx.AsyncClient) -> Provider:
+    """
+    创建 Provider 并预热到其端点的连接
     
-    # 初始化 Provider 列表
-    providers = []
+    Args:
+        provider_config: 提供者配置
+        client: 共享的 HTTP 客户端
+        
+    Returns:
+        Provider: 已预热的 Provider 实例
+    """
+    provider = Provider(provider_config, client=client)
+    await provider.warmup()
+    return provider
+
+
+async def forward_batch(state, batch: List[bytes]):
+    """
+    将一批 webhook 请求体合并为一个 JSON 数组转发
     
-    # 检查配置文件是否存在
-    providers_config_file = Path("providers_config.py")
-    if not providers_config_file.exists():
-        alert_logger.warning(f"未找到 providers_config.py 文件，请从 providers_config.py.example 复制并配置")
+    各请求体本身已是合法的 JSON，直接按字节拼接，不重新序列化。
     
-    # 如果没有配置提供者，使用默认配置
+    Args:
+        state: app.state
+        batch: 待转发的请求体列表
+    """
+    alert_logger = state.alert_logger
+    body = b"[" + b",".join(batch) + b"]"
+    try:
+        forward_result = await state.load_balancer.send(body)
+    except Exception as e:
+        alert_logger.error("批量转发报警时发生异常 [数量=%d]: %s", len(batch), e)
+        return
+    provider_name = forward_result.provider or "unknown"
+    error_msg = forward_result.error or "未知错误"
+    if forward_result.success:
+        alert_logger.info("报警批量转发成功 [提供者=%s, 数量=%d]", provider_name, len(batch))
+    if forward_result.failed_providers:
+        # 镜像转发时只记录发送失败的 Provider
+        failed_names = ", ".join(forward_result.failed_providers)
+        alert_logger.warning("报警批量转发失败 [提供者=%s, 数量=%d, 错误=%s]", failed_names, len(batch), error_msg)
+    elif not forward_result.success:
+        alert_logger.warning("报警批量转发失败 [提供者=%s, 数量=%d, 错误=%s]", provider_name, len(batch), error_msg)
+
+
+async def batch_flusher(state, max_batch: int, max_delay: float, max_in_flight: int):
+    """
+    后台批量转发任务
+    
+    从 state.batch_queue 取出请求体，凑满 max_batch 个或等待超过 max_delay 秒后
+    作为一批交给独立的任务转发，不等待上一批转发完成；同时进行中的批次不超过
+    max_in_flight 个，达到上限时暂停取队列，由队列的容量限制向请求方施加背压。
+    取到 None 时转发剩余请求体，并等待所有批次转发完成后退出。
+    
+    Args:
+        state: app.state
+        max_batch: 每批最多包含的请求体数量
+        max_delay: 每批最长等待时间（秒）
+        max_in_flight: 同时进行中的批次上限
+    """
+    batch_queue: asyncio.Queue = state.batch_queue
+    loop = asyncio.get_running_loop()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    tasks = set()
+    
+    def on_done(task: asyncio.Task):
+        tasks.discard(task)
+        in_flight.release()
+    
+    stopping = False
+    while not stopping:
+        body = await batch_queue.get()
+        if body is None:
+            break
+        batch = [body]
+        deadline = loop.time() + max_delay
+        while len(batch) < max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                body = await asyncio.wait_for(batch_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if body is None:
+                stopping = True
+                break
+            batch.append(body)
+        await in_flight.acquire()
+        task = asyncio.create_task(forward_batch(state, batch))
+        tasks.add(task)
+        task.add_done_callback(on_done)
+    
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def startup_event(app: FastAPI):
+    """
+    应用启动时启动日志写入线程并初始化负载均衡器
+    
+    运行时状态（负载均衡器、共享的 HTTP 客户端等）都保存在 app.state 上，
+    在 gunicorn 等多进程部署下由每个工作进程各自初始化；
+    日志记录器在模块导入时已创建，这里只启动后台写入线程。
+    
+    Args:
+        app: FastAPI 应用实例
+    """
+    state = app.state
+    
+    # 启动后台日志写入线程
+    alert_logger = state.alert_logger
+    state.log_listener.start()
+    alert_logger.info("=" * 50)
+    alert_logger.info("Webhook报警接收服务启动")
+    
+    # 加载配置（读取配置文件，放到工作线程中执行）
+    config = await to_thread.run_sync(AppConfig)
+    state.split_alerts = config.split_alerts
+    
+    # 配置文件为空或不存在时，AppConfig 已回退到默认配置
     if not config.providers:
-        if DEFAULT_PROVIDERS:
-            config.providers = [ProviderConfig(**p) for p in DEFAULT_PROVIDERS]
-            alert_logger.info("使用默认 Provider 配置")
-        else:
-            alert_logger.warning("未找到任何 Provider 配置（providers_config.py 为空或不存在）")
+        alert_logger.warning(
+            "未找到任何 Provider 配置（配置文件为空或不存在），"
+            "请从 providers_config.toml.example 或 providers_config.py.example 复制并配置"
+        )
     else:
-        alert_logger.info(f"从配置文件加载了 {len(config.providers)} 个 Provider 配置")
+        alert_logger.info(f"共加载了 {len(config.providers)} 个 Provider 配置")
     
-    # 创建 Provider 实例
+    # 创建共享的 HTTP 客户端，所有 Provider 复用同一个连接池（HTTP/2 多路复用，空闲连接保留 5 分钟）
+    # 连接池大小与转发并发上限一致，排队由负载均衡器的信号量完成，不会因等待连接池超时而失败
+    # 建立连接失败时重试一次；默认超时仅作兜底，各 Provider 请求时按自身配置的超时覆盖
+    max_connections = config.max_concurrent_forwards
+    http_client = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(100, max_connections),
+                keepalive_expiry=300
+            ),
+            retries=1
+        ),
+        timeout=httpx.Timeout(30.0)
+    )
+    state.http = http_client
+    
+    # 创建 Provider 实例，并发预热各端点的连接
+    enabled_configs = []
     for provider_config in config.providers:
         if provider_config.enabled:
-            provider = Provider(provider_config)
-            providers.append(provider)
-            alert_logger.info(f"已加载 Provider: {provider.name} (端点: {provider_config.endpoint})")
+            enabled_configs.append(provider_config)
         else:
             alert_logger.info(f"跳过禁用的 Provider: {provider_config.name}")
+    providers = list(await asyncio.gather(*(build_provider(cfg, http_client) for cfg in enabled_configs)))
+    for provider in providers:
+        alert_logger.info(f"已加载 Provider: {provider.name} (端点: {provider.config.endpoint})")
     
     # 初始化负载均衡器
     if providers:
         try:
             strategy = config.load_balancer_strategy
-            load_balancer = create_load_balancer(strategy, providers)
+            state.load_balancer = create_load_balancer(strategy, providers, config.max_concurrent_forwards)
             alert_logger.info(f"负载均衡器已启动: {strategy} 策略, 共 {len(providers)} 个 Provider")
+            if state.split_alerts:
+                alert_logger.info("转发模式: 按单条报警拆分转发")
         except ValueError as e:
             alert_logger.error(f"负载均衡器初始化失败: {e}")
             # 初始化失败，默认在本地记录
-            load_balancer = None
-            alert_logger.info(f"初始化负载均衡器失败，将在本地记录报警")
+            state.load_balancer = None
+            alert_logger.info("初始化负载均衡器失败，将在本地记录报警")
     else:
-        load_balancer = None
+        state.load_balancer = None
         alert_logger.info("服务模式: 仅本地记录（未配置云平台提供者，不转发到外部服务）")
+    
+    # 启用批量转发时，启动后台批量转发任务
+    # 队列容量按并发上限个满批次计算，队列满时 /webhook 改为直接转发
+    if state.load_balancer and config.batch_max_size > 0:
+        state.batch_queue = asyncio.Queue(maxsize=config.batch_max_size * config.max_concurrent_forwards)
+        state.batch_task = asyncio.create_task(
+            batch_flusher(
+                state,
+                config.batch_max_size,
+                config.batch_max_delay_ms / 1000,
+                config.max_concurrent_forwards
+            )
+        )
+        alert_logger.info(
+            f"转发模式: 批量转发（每批最多 {config.batch_max_size} 个，最长等待 {config.batch_max_delay_ms} 毫秒）"
+        )
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """应用关闭时清理资源"""
-    global load_balancer
+async def shutdown_event(app: FastAPI):
+    """
+    应用关闭时清理资源
     
-    # 关闭所有 Provider 的连接
-    if load_balancer:
-        for provider in load_balancer.providers:
-            try:
-                await provider.close()
-            except Exception as e:
-                if alert_logger:
-                    alert_logger.error(f"关闭 Provider {provider.name} 连接失败: {e}")
+    Args:
+        app: FastAPI 应用实例
+    """
+    state = app.state
+    alert_logger = state.alert_logger
+    
+    # 转发批量队列中剩余的报警后停止后台任务
+    if state.batch_task:
+        await state.batch_queue.put(None)
+        await state.batch_task
+        state.batch_task = None
+        state.batch_queue = None
+    
+    # 关闭共享的 HTTP 客户端连接
+    if state.http:
+        try:
+            await state.http.aclose()
+        except Exception as e:
+            alert_logger.error(f"关闭 HTTP 客户端连接失败: {e}")
+        state.http = None
+    
+    alert_logger.info("服务已关闭")
     
-    if alert_logger:
-        alert_logger.info("服务已关闭")
+    # 停止后台日志线程（会先写完队列中剩余的日志），等待写盘时不阻塞事件循环
+    await to_thread.run_sync(state.log_listener.stop)
 
 
-@app.post("/webhook")
-async def webhook_handler(payload: Dict[str, Any]):
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时启动日志线程并初始化负载均衡器，关闭时清理资源"""
+    await startup_event(app)
+    try:
+        yield
+    finally:
+        await shutdown_event(app)
+
+
+app = FastAPI(
+    title="Webhook报警接收服务",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# 日志在导入时配置（创建目录和处理器），不在事件循环中执行阻塞的文件系统操作
+app.state.alert_logger, app.state.log_listener = setup_logging()
+
+# 运行时状态的初始值，由 startup_event 在每个工作进程中填充
+app.state.load_balancer = None
+app.state.http = None
+app.state.split_alerts = False
+app.state.batch_queue = None
+app.state.batch_task = None
+
+
+# /webhook 直接读取原始请求体，不经过 FastAPI 的参数解析，需手动声明请求体以保留接口文档
+WEBHOOK_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "description": "Grafana webhook 原始报警数据（receiver, status, alerts, title 等字段）",
+                    "additionalProperties": True
+                }
+            }
+        }
+    }
+}
+
+
+@app.post("/webhook", openapi_extra=WEBHOOK_OPENAPI_EXTRA)
+async def webhook_handler(request: Request):
     """
     接收webhook请求并记录到本地日志
     
-    FastAPI 会自动将 JSON 请求体解析为 Python 字典。
-    无需手动解析，payload 参数已包含完整的 Grafana webhook 数据。
+    直接读取原始请求体，仅解析一次用于提取日志摘要字段；
+    完整报警数据的日志记录和转发都使用原始字节，不再重新序列化。
     
     Args:
-        payload: webhook请求体（FastAPI 自动从 JSON 解析为 Dict[str, Any]）
-                包含完整的 Grafana 格式：receiver, status, alerts, title 等所有字段
+        request: webhook请求，请求体为完整的 Grafana 格式 JSON：
+                receiver, status, alerts, title 等所有字段
         
     Returns:
         Dict[str, Any]: 接收结果
     """
-    if alert_logger is None:
-        return {
-            "status": "error",
-            "message": "Local alert logger not initialized"
-        }
+    state = request.app.state
+    alert_logger = state.alert_logger
+    raw: bytes = await request.body()
+    try:
+        payload = orjson.loads(raw)
+        if not isinstance(payload, dict):
+            raise ValueError("payload must be a JSON object")
+    except ValueError as e:
+        alert_logger.error("解析报警数据失败: %s", e)
+        # 与请求体校验失败时一致返回 422，避免发送方把无效数据当作已送达
+        return ORJSONResponse(
+            status_code=422,
+            content={
+                "status": "error",
+                "message": f"Invalid alert payload: {str(e)}"
+            }
+        )
     
     # 记录接收到的报警信息（保持原始 Grafana 格式，不做修改）
     try:
-        # 提取 Grafana payload 中的关键信息用于日志
-        status = payload.get("status", "unknown")
-        alert_count = len(payload.get("alerts", []))
-        title = payload.get("title", "")
-        receiver = payload.get("receiver", "")
-        alert_logger.info(f"收到报警 [接收者={receiver}, 状态={status}, 数量={alert_count}, 标题={title}]")
-        # 记录完整的 payload（完全保持 Grafana 原始格式，包含所有字段如 timestamp、alerts 等）
-        alert_logger.info(f"完整报警数据: {json.dumps(payload, ensure_ascii=False, indent=2)}")
+        alerts = payload.get("alerts", [])
+        alert_count = len(alerts)
+        # 日志级别高于 INFO 时跳过摘要字段的提取和日志记录
+        if alert_logger.isEnabledFor(logging.INFO):
+            # 提取 Grafana payload 中的关键信息用于日志
+            status = payload.get("status", "unknown")
+            title = payload.get("title", "")
+            receiver = payload.get("receiver", "")
+            # 摘要和完整的原始请求体记录为同一条日志（完全保持 Grafana 原始格式，包含所有字段如 timestamp、alerts 等）
+            # 请求体由 JsonLogFormatter 在后台写入线程中解码后追加到摘要之后
+            alert_logger.info(
+                "收到报警 [接收者=%s, 状态=%s, 数量=%d, 标题=%s]",
+                receiver, status, alert_count, title,
+                extra={"payload": raw}
+            )
     except Exception as e:
-        alert_logger.error(f"记录报警日志失败: {e}")
+        alert_logger.error("记录报警日志失败: %s", e)
         return {
             "status": "error",
             "message": f"Failed to record alert: {str(e)}"
@@ -168,49 +466,84 @@ async def webhook_handler(payload: Dict[str, Any]):
     
     # 如果有负载均衡器，尝试转发到云平台
     forward_success = False
+    load_balancer = state.load_balancer
     if load_balancer:
+        if state.split_alerts and isinstance(alerts, list) and alert_count > 1:
+            # 每条报警单独组成一个 payload
+            bodies = split_alert_bodies(payload, alerts)
+        else:
+            bodies = [raw]
+        
+        # 批量转发：放入队列后立即返回 202，由后台任务合并转发
+        batch_queue = state.batch_queue
+        if batch_queue is not None:
+            pending = []
+            for body in bodies:
+                try:
+                    batch_queue.put_nowait(body)
+                except asyncio.QueueFull:
+                    pending.append(body)
+            if not pending:
+                return Response(content=BATCH_QUEUED_RESPONSE_BODY, status_code=202, media_type="application/json")
+            # 队列已满时不再排队，剩余报警直接转发（受并发上限约束）
+            alert_logger.warning("批量转发队列已满，直接转发 %d 条报警", len(pending))
+            bodies = pending
+        
         try:
-            forward_result = await load_balancer.send(payload)
-            forward_success = forward_result.get("success", False)
+            if len(bodies) > 1:
+                forward_results = await asyncio.gather(*(load_balancer.send(body) for body in bodies))
+            else:
+                forward_results = [await load_balancer.send(bodies[0])]
             
             # 记录转发结果
-            if forward_success:
-                provider_name = forward_result.get("provider", "unknown")
-                alert_logger.info(f"报警转发成功 [提供者={provider_name}]")
-            else:
-                error_msg = forward_result.get("error", "未知错误")
-                provider_name = forward_result.get("provider", "unknown")
-                alert_logger.warning(f"报警转发失败 [提供者={provider_name}, 错误={error_msg}]")
+            log_success = alert_logger.isEnabledFor(logging.INFO)
+            provider_names = []
+            for forward_result in forward_results:
+                provider_name = forward_result.provider or "unknown"
+                error_msg = forward_result.error or "未知错误"
+                if forward_result.success:
+                    if log_success:
+                        alert_logger.info("报警转发成功 [提供者=%s]", provider_name)
+                    if provider_name not in provider_names:
+                        provider_names.append(provider_name)
+                if forward_result.failed_providers:
+                    # 镜像转发时只记录发送失败的 Provider，部分成功仍视为已转发
+                    failed_names = ", ".join(forward_result.failed_providers)
+                    alert_logger.warning("报警转发失败 [提供者=%s, 错误=%s]", failed_names, error_msg)
+                elif not forward_result.success:
+                    alert_logger.warning("报警转发失败 [提供者=%s, 错误=%s]", provider_name, error_msg)
+            forward_success = all(forward_result.success for forward_result in forward_results)
+            provider_name = ", ".join(provider_names)
         except Exception as e:
-            alert_logger.error(f"转发报警时发生异常: {e}")
+            alert_logger.error("转发报警时发生异常: %s", e)
             forward_success = False
     
     # 返回响应（固定格式，200状态码）
     # 即使转发失败，也返回成功，因为已经记录在本地日志
     if forward_success:
-        return {
-            "status": "success",
-            "message": f"Alert received and forwarded to {provider_name}"
-        }
+        body = forwarded_response_body(provider_name)
     else:
-        return {
-            "status": "success",
-            "message": "Alert received and recorded in local log only"
-        }
+        body = LOCAL_ONLY_RESPONSE_BODY
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/status")
-async def get_status():
+async def get_status(request: Request):
     """
     获取服务状态
     
+    Args:
+        request: 请求对象，用于访问 app.state
+        
     Returns:
         Dict[str, Any]: 服务状态信息
     """
+    state = request.app.state
+    load_balancer = state.load_balancer
     status = {
         "service": "webhook-alert-receiver",
         "status": "running",
-        "log_enabled": alert_logger is not None,
+        "log_enabled": state.alert_logger is not None,
         "load_balancer": None
     }
     
@@ -244,6 +577,8 @@ if __name__ == "__main__":
         "main:app",
         host=config.host,
         port=config.port,
-        reload=True
+        loop="uvloop",
+        http="httptools",
+        workers=config.workers
     )
 
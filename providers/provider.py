@@ -1,68 +1,117 @@
 """
 云平台提供者
 """
-from typing import Dict, Any
+from typing import Callable, Dict, List
+import logging
 import httpx
 from config import ProviderConfig
 
+logger = logging.getLogger(__name__)
+
+# 启动预热请求的超时时间（秒），避免不可达的端点拖慢启动
+WARMUP_TIMEOUT = 5
+
+# 建立连接的超时时间（秒），端点不可达时尽快失败
+CONNECT_TIMEOUT = 2.0
+
+# 从连接池获取连接的超时时间（秒）
+POOL_TIMEOUT = 1.0
+
 
 class Provider:
     """云平台提供者，负责转发 Grafana webhook 请求到外部服务"""
     
-    def __init__(self, config: ProviderConfig):
+    __slots__ = ("config", "client", "_headers", "_timeout", "is_available", "_availability_listeners")
+    
+    def __init__(self, config: ProviderConfig, client: httpx.AsyncClient):
         """
         初始化提供者
         
         Args:
             config: 提供者配置
+            client: 所有 Provider 共享的 HTTP 客户端（连接池由调用方负责关闭）
         """
         self.config = config
-        self.client = httpx.AsyncClient(timeout=config.timeout)
+        self.client = client
+        # 请求头在初始化时确定，确保 Content-Type 为 application/json（如果配置中没有指定）
+        self._headers: Dict[str, str] = {**config.headers}
+        self._headers.setdefault("Content-Type", "application/json")
+        # 连接和取连接使用较短的超时，读写使用配置中的 timeout
+        self._timeout = httpx.Timeout(
+            connect=CONNECT_TIMEOUT,
+            read=config.timeout,
+            write=config.timeout,
+            pool=POOL_TIMEOUT
+        )
+        # 是否可用（是否启用），初始值取自配置，之后仅在 set_enabled 中更新
+        # 配置对象在进程内共享（按进程缓存），运行时的启用状态只保存在 Provider 上
+        self.is_available: bool = config.enabled
+        self._availability_listeners: List[Callable[["Provider"], None]] = []
     
     @property
     def name(self) -> str:
         """提供者名称"""
         return self.config.name
     
-    @property
-    def is_available(self) -> bool:
+    def add_availability_listener(self, listener: Callable[["Provider"], None]):
         """
-        检查是否可用（是否启用）
+        注册可用状态变化的回调
         
-        Returns:
-            bool: 是否可用
+        Args:
+            listener: 回调函数，可用状态变化时以当前 Provider 为参数调用
         """
-        return self.config.enabled
+        self._availability_listeners.append(listener)
     
-    async def send_webhook(self, payload: Dict[str, Any]) -> bool:
+    def set_enabled(self, enabled: bool):
+        """
+        启用或禁用 Provider，状态变化时通知已注册的回调
+        
+        Args:
+            enabled: 是否启用
+        """
+        if self.is_available == enabled:
+            return
+        self.is_available = enabled
+        for listener in self._availability_listeners:
+            listener(self)
+    
+    async def warmup(self):
+        """
+        预热到端点的连接（DNS 解析、TCP/TLS 握手）
+        
+        发送一个 HEAD 请求，仅用于在共享连接池中建立连接，忽略响应状态和错误。
+        """
+        try:
+            await self.client.head(
+                self.config.endpoint,
+                headers=self.config.headers,
+                timeout=WARMUP_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning("Provider %s 预热失败: %r", self.name, e)
+    
+    async def send_webhook(self, body: bytes) -> bool:
         """
         发送webhook请求
         
         Args:
-            payload: 要发送的数据（Grafana webhook 原始格式，完全保持不变）
+            body: 要发送的原始 JSON 请求体（Grafana webhook 原始格式，完全保持不变）
             
         Returns:
             bool: 是否发送成功
         """
         try:
-            # 确保 Content-Type 为 application/json（如果配置中没有指定）
-            headers = self.config.headers.copy()
-            if "Content-Type" not in headers:
-                headers["Content-Type"] = "application/json"
-            
-            # 直接转发原始 payload，不做任何修改
+            # 直接转发原始请求体，不做任何修改
             response = await self.client.post(
                 self.config.endpoint,
-                json=payload,  # 完全保持 Grafana 原始格式
-                headers=headers
+                content=body,  # 完全保持 Grafana 原始格式
+                headers=self._headers,
+                timeout=self._timeout
             )
             response.raise_for_status()
             return True
         except Exception as e:
-            print(f"Provider {self.name} 发送失败: {e}")
+            # 超时等异常的 str() 可能为空，记录异常类型便于排查
+            logger.warning("Provider %s 发送失败: %r", self.name, e)
             return False
-    
-    async def close(self):
-        """关闭HTTP客户端连接"""
-        await self.client.aclose()
 